@@ -0,0 +1,40 @@
+import filecmp
+import pathlib
+from collections.abc import Callable
+
+import pandas
+import pytest
+
+
+def _assert_tsv_files_equal(
+    *,
+    test_file_path: pathlib.Path,
+    expected_file_path: pathlib.Path,
+    index_col: int | None = None,
+) -> None:
+    """
+    Assert that a TSV file written during a test matches the expected one.
+
+    Identical bytes imply identical frames, so both files are only parsed when they differ (to produce a readable diff).
+    """
+    if filecmp.cmp(test_file_path, expected_file_path, shallow=False):
+        return
+
+    test_data_frame = pandas.read_table(filepath_or_buffer=test_file_path, index_col=index_col)
+    expected_data_frame = pandas.read_table(filepath_or_buffer=expected_file_path, index_col=index_col)
+
+    # Pandas assertion makes no reference to the files being compared when it fails
+    try:
+        pandas.testing.assert_frame_equal(left=test_data_frame, right=expected_data_frame)
+    except AssertionError as exception:
+        message = (
+            f"\n\nTest file path: {test_file_path}\nExpected file path: {expected_file_path}\n\n"
+            f"{str(exception)}\n\n"
+        )
+        raise AssertionError(message)
+
+
+@pytest.fixture(scope="session")
+def assert_tsv_files_equal() -> Callable[..., None]:
+    """Shared comparison of written and expected TSV files, for both the offline and the live service tests."""
+    return _assert_tsv_files_equal
@@ -82,10 +82,8 @@ def bin_all_reduced_s3_logs_by_object_key(
         )
         del reduced_data_frame
 
-        object_keys_to_data = {
-            row.name: {"timestamp": row["timestamp"], "bytes_sent": row["bytes_sent"], "ip_address": row["ip_address"]}
-            for _, row in binned_data_frame.iterrows()
-        }
+        # Avoid constructing an intermediate Series for every object key, as `iterrows` would
+        object_keys_to_data = binned_data_frame.to_dict(orient="index")
         del binned_data_frame
 
         with open(file=started_tracking_file_path, mode="a") as io:
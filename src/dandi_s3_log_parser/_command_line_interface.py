@@ -1,6 +1,5 @@
 """Call the DANDI S3 log parser from the command line."""
 
-import collections
 import pathlib
 
 import click
@@ -69,9 +68,7 @@ def _reduce_all_dandi_raw_s3_logs_cli(
 ) -> None:
     split_excluded_years = excluded_years.split(",") if excluded_years is not None else []
     split_excluded_ips = excluded_ips.split(",") if excluded_ips is not None else []
-    handled_excluded_ips = collections.defaultdict(bool) if len(split_excluded_ips) != 0 else None
-    for excluded_ip in split_excluded_ips:
-        handled_excluded_ips[excluded_ip] = True
+    handled_excluded_ips = frozenset(split_excluded_ips) if len(split_excluded_ips) != 0 else None
     maximum_buffer_size_in_bytes = maximum_buffer_size_in_mb * 10**6
 
     reduce_all_dandi_raw_s3_logs(
@@ -1,18 +1,17 @@
 """Primary functions for reducing raw S3 log file for DANDI."""
 
-import collections
 import os
 import random
 import traceback
 import uuid
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 from concurrent.futures import ProcessPoolExecutor, as_completed
 
 import tqdm
 from pydantic import DirectoryPath, Field, FilePath, validate_call
 
 from ._error_collection import _collect_error
-from ._s3_log_file_reducer import reduce_raw_s3_log
+from ._s3_log_file_reducer import _get_excluded_ips_set, reduce_raw_s3_log
 
 
 @validate_call
@@ -23,7 +22,7 @@ def reduce_all_dandi_raw_s3_logs(
     maximum_number_of_workers: int = Field(ge=1, default=1),
     maximum_buffer_size_in_bytes: int = 4 * 10**9,
     excluded_years: list[str] | None = None,
-    excluded_ips: collections.defaultdict[str, bool] | None = None,
+    excluded_ips: list[str] | set[str] | frozenset[str] | Mapping[str, bool] | None = None,
 ) -> None:
     """
     Batch parse all raw S3 log files in a folder and write the results to a folder of TSV files.
@@ -53,11 +52,12 @@ def reduce_all_dandi_raw_s3_logs(
 
         Automatically splits this total amount over the maximum number of workers if `maximum_number_of_workers` is
         greater than one.
-    excluded_ips : collections.defaultdict(bool), optional
-        A lookup table whose keys are IP addresses to exclude from reduction.
+    excluded_ips : list, set, or frozenset of strings, or mapping of strings to booleans, optional
+        The IP addresses to exclude from reduction.
+        A lookup table (such as `collections.defaultdict(bool)`) excludes the keys whose value is True.
     """
     excluded_years = excluded_years or []
-    excluded_ips = excluded_ips or collections.defaultdict(bool)
+    excluded_ips = _get_excluded_ips_set(excluded_ips=excluded_ips)
 
     object_key_handler = _get_default_dandi_object_key_handler()
 
@@ -163,7 +163,7 @@ def _multi_worker_reduce_dandi_raw_s3_log(
     reduced_s3_log_file_path: FilePath,
     maximum_number_of_workers: int,
     maximum_buffer_size_in_bytes: int,
-    excluded_ips: collections.defaultdict[str, bool],
+    excluded_ips: frozenset[str],
 ) -> None:
     """
     A mostly pass-through function to calculate the worker index on the worker and target the correct subfolder.
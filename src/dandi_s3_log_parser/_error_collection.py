@@ -1,7 +1,8 @@
 import datetime
+import functools
 import importlib.metadata
 
-from ._config import DANDI_S3_LOG_PARSER_BASE_FOLDER_PATH
+from ._config import _ERRORS_FOLDER_PATH
 
 
 def _collect_error(message: str, error_type: str, task_id: str | None = None) -> None:
@@ -21,20 +22,23 @@ def _collect_error(message: str, error_type: str, task_id: str | None = None) ->
         A unique identifier for the task that generated the error.
         Added as an identifying tag on the error collection file name.
     """
-    errors_folder_path = DANDI_S3_LOG_PARSER_BASE_FOLDER_PATH / "errors"
-    errors_folder_path.mkdir(exist_ok=True)
-
-    dandi_s3_log_parser_version = importlib.metadata.version(distribution_name="dandi_s3_log_parser")
+    dandi_s3_log_parser_version = _get_dandi_s3_log_parser_version()
     date = datetime.datetime.now().strftime("%y%m%d")
 
     error_collection_file_name = f"v{dandi_s3_log_parser_version}_{date}_{error_type}_errors"
     if task_id is not None:
         error_collection_file_name += f"_{task_id}"
     error_collection_file_name += ".txt"
-    error_collection_file_path = errors_folder_path / error_collection_file_name
+    error_collection_file_path = _ERRORS_FOLDER_PATH / error_collection_file_name
 
     padded_message = f"{message}\n\n"
     with open(file=error_collection_file_path, mode="a") as io:
         io.write(padded_message)
 
     return None
+
+
+@functools.lru_cache
+def _get_dandi_s3_log_parser_version() -> str:
+    """Cache the version lookup, which otherwise searches all installed distributions on every call."""
+    return importlib.metadata.version(distribution_name="dandi_s3_log_parser")
@@ -1,4 +1,3 @@
-import collections
 import re
 
 _KNOWN_OPERATION_TYPES = (
@@ -69,9 +68,7 @@ _KNOWN_OPERATION_TYPES = (
     # "objects;"  # Unsure about this last one; it showed up in a scan of all 7-th string elements
 )
 
-_IS_OPERATION_TYPE_KNOWN = collections.defaultdict(bool)
-for request_type in _KNOWN_OPERATION_TYPES:
-    _IS_OPERATION_TYPE_KNOWN[request_type] = True
+_KNOWN_OPERATION_TYPES_SET = frozenset(_KNOWN_OPERATION_TYPES)
 
 _S3_LOG_FIELDS = (
     "bucket_owner",
@@ -102,8 +99,29 @@ _S3_LOG_FIELDS = (
     "access_point_arn",
     "acl_required",
 )
-_FullLogLine = collections.namedtuple("FullLogLine", _S3_LOG_FIELDS)
+# Positions of the fields used during reduction within a full parsed log line
+_TIMESTAMP_INDEX = _S3_LOG_FIELDS.index("timestamp")
+_IP_ADDRESS_INDEX = _S3_LOG_FIELDS.index("ip_address")
+_OPERATION_INDEX = _S3_LOG_FIELDS.index("operation")
+_OBJECT_KEY_INDEX = _S3_LOG_FIELDS.index("object_key")
+_HTTP_STATUS_CODE_INDEX = _S3_LOG_FIELDS.index("http_status_code")
+_BYTES_SENT_INDEX = _S3_LOG_FIELDS.index("bytes_sent")
 
 _S3_LOG_REGEX = re.compile(pattern=r'"([^"]+)"|\[([^]]+)]|([^ ]+)')
 
+_MONTH_ABBREVIATION_TO_ZERO_PADDED_NUMBER = {
+    "Jan": "01",
+    "Feb": "02",
+    "Mar": "03",
+    "Apr": "04",
+    "May": "05",
+    "Jun": "06",
+    "Jul": "07",
+    "Aug": "08",
+    "Sep": "09",
+    "Oct": "10",
+    "Nov": "11",
+    "Dec": "12",
+}
+
 _KNOWN_SERVICES = ("GitHub", "AWS", "GCP", "VPN")  # Azure has problems; see _ip_utils.py for more info
@@ -1,11 +1,11 @@
 """Primary functions for reducing raw S3 log files."""
 
 import collections
-import datetime
+import functools
 import pathlib
 import traceback
 import uuid
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 from typing import Literal
 
 import tqdm
@@ -13,8 +13,18 @@ from pydantic import FilePath, validate_call
 
 from ._buffered_text_reader import BufferedTextReader
 from ._error_collection import _collect_error
-from ._globals import _IS_OPERATION_TYPE_KNOWN, _KNOWN_OPERATION_TYPES, _S3_LOG_FIELDS
-from ._s3_log_line_parser import _get_full_log_line, _parse_s3_log_line
+from ._globals import (
+    _BYTES_SENT_INDEX,
+    _HTTP_STATUS_CODE_INDEX,
+    _IP_ADDRESS_INDEX,
+    _KNOWN_OPERATION_TYPES,
+    _KNOWN_OPERATION_TYPES_SET,
+    _OBJECT_KEY_INDEX,
+    _OPERATION_INDEX,
+    _S3_LOG_FIELDS,
+    _TIMESTAMP_INDEX,
+)
+from ._s3_log_line_parser import _get_full_log_line, _get_iso_timestamp, _parse_s3_log_line
 
 
 @validate_call
@@ -26,7 +36,7 @@ def reduce_raw_s3_log(
     object_key_parents_to_reduce: list[str] | None = None,
     maximum_buffer_size_in_bytes: int = 4 * 10**9,
     operation_type: Literal[_KNOWN_OPERATION_TYPES] = "REST.GET.OBJECT",
-    excluded_ips: collections.defaultdict[str, bool] | None = None,
+    excluded_ips: list[str] | set[str] | frozenset[str] | Mapping[str, bool] | None = None,
     object_key_handler: Callable | None = None,
     line_buffer_tqdm_kwargs: dict | None = None,
 ) -> None:
@@ -58,13 +68,17 @@ def reduce_raw_s3_log(
         Actual RAM usage will be higher due to overhead and caching.
     operation_type : str, default: "REST.GET"
         The type of operation to filter for.
-    excluded_ips : collections.defaultdict of strings to booleans, optional
-        A lookup table / hash map whose keys are IP addresses and values are True to exclude from parsing.
+    excluded_ips : list, set, or frozenset of strings, or mapping of strings to booleans, optional
+        The IP addresses to exclude from parsing.
+        A lookup table (such as `collections.defaultdict(bool)`) excludes the keys whose value is True.
     object_key_handler : callable, optional
         If your object keys in the raw log require custom handling (i.e., they contain slashes that you do not wish to
         translate into nested directory paths) then define and pass a function that takes the `object_key` as a string
         and returns the corrected form.
 
+        The handler must be pure (its result depending only on the `object_key`), since its results are cached and
+        reused for repeated object keys within the log file.
+
         For example:
 
         ```python
@@ -83,8 +97,14 @@ def reduce_raw_s3_log(
     """
     fields_to_reduce = fields_to_reduce or ["object_key", "timestamp", "bytes_sent", "ip_address"]
     object_key_parents_to_reduce = object_key_parents_to_reduce or []  # ["blobs", "zarr"] # TODO: move to DANDI side
-    excluded_ips = excluded_ips or collections.defaultdict(bool)
-    object_key_handler = object_key_handler or (lambda object_key: object_key)
+    excluded_ips = _get_excluded_ips_set(excluded_ips=excluded_ips)
+    # The same object keys are requested many times within a single log file, so only handle each one once
+    # The default identity handler gains nothing from caching and is left as is
+    object_key_handler = (
+        functools.lru_cache(maxsize=None)(object_key_handler)
+        if object_key_handler is not None
+        else (lambda object_key: object_key)
+    )
     line_buffer_tqdm_kwargs = line_buffer_tqdm_kwargs or dict()
 
     default_tqdm_kwargs = {"desc": "Parsing line buffers...", "leave": False}
@@ -108,43 +128,50 @@ def reduce_raw_s3_log(
 
     task_id = str(uuid.uuid4())[:5]
 
+    # Messages are buffered by error type and written once per file, rather than reopening the error file per line
+    errors_buffer = collections.defaultdict(list)
+
     # Admittedly, this is particular to DANDI
     fast_fields_to_reduce = set(fields_to_reduce) == {"object_key", "timestamp", "bytes_sent", "ip_address"}
     fast_object_key_parents_to_reduce = set(object_key_parents_to_reduce) == {"blobs", "zarr"}
     fast_fields_case = fast_fields_to_reduce and fast_object_key_parents_to_reduce
     # TODO: add dumping to file within comprehension to alleviate RAM accumulation
     # Would need a start/completed tracking similar to binning to ensure no corruption however
-    if fast_fields_case is True:
-        reduced_s3_log_lines = [
-            reduced_s3_log_line
-            for raw_s3_log_lines_buffer in progress_bar_iterator
-            for raw_s3_log_line in raw_s3_log_lines_buffer
-            if (
-                reduced_s3_log_line := _fast_dandi_reduce_raw_s3_log_line(
-                    raw_s3_log_line=raw_s3_log_line,
-                    operation_type=operation_type,
-                    excluded_ips=excluded_ips,
-                    task_id=task_id,
+    try:
+        if fast_fields_case is True:
+            reduced_s3_log_lines = [
+                reduced_s3_log_line
+                for raw_s3_log_lines_buffer in progress_bar_iterator
+                for raw_s3_log_line in raw_s3_log_lines_buffer
+                if (
+                    reduced_s3_log_line := _fast_dandi_reduce_raw_s3_log_line(
+                        raw_s3_log_line=raw_s3_log_line,
+                        operation_type=operation_type,
+                        excluded_ips=excluded_ips,
+                        errors_buffer=errors_buffer,
+                    )
                 )
-            )
-            is not None
-        ]
-    else:
-        reduced_s3_log_lines = [
-            reduced_s3_log_line
-            for raw_s3_log_lines_buffer in progress_bar_iterator
-            for raw_s3_log_line in raw_s3_log_lines_buffer
-            if (
-                reduced_s3_log_line := _reduce_raw_s3_log_line(
-                    raw_s3_log_line=raw_s3_log_line,
-                    operation_type=operation_type,
-                    excluded_ips=excluded_ips,
-                    object_key_handler=object_key_handler,
-                    task_id=task_id,
+                is not None
+            ]
+        else:
+            reduced_s3_log_lines = [
+                reduced_s3_log_line
+                for raw_s3_log_lines_buffer in progress_bar_iterator
+                for raw_s3_log_line in raw_s3_log_lines_buffer
+                if (
+                    reduced_s3_log_line := _reduce_raw_s3_log_line(
+                        raw_s3_log_line=raw_s3_log_line,
+                        operation_type=operation_type,
+                        excluded_ips=excluded_ips,
+                        object_key_handler=object_key_handler,
+                        errors_buffer=errors_buffer,
+                    )
                 )
-            )
-            is not None
-        ]
+                is not None
+            ]
+    finally:
+        for error_type, messages in errors_buffer.items():
+            _collect_error(message="\n\n".join(messages), error_type=error_type, task_id=task_id)
 
     # TODO: generalize header to rely on the selected fields and ensure order matches
     header = "timestamp\tip_address\tobject_key\tbytes_sent\n" if len(reduced_s3_log_lines) != 0 else ""
@@ -155,12 +182,29 @@ def reduce_raw_s3_log(
     return None
 
 
+def _get_excluded_ips_set(
+    *, excluded_ips: list[str] | set[str] | frozenset[str] | Mapping[str, bool] | None
+) -> frozenset[str]:
+    """
+    Normalize the supported forms of `excluded_ips` to a frozenset for fast membership tests.
+
+    Lookup tables (the form accepted by earlier versions) only exclude the IP addresses whose value is True.
+    """
+    if excluded_ips is None:
+        return frozenset()
+
+    if isinstance(excluded_ips, Mapping):
+        return frozenset(ip_address for ip_address, is_excluded in excluded_ips.items() if is_excluded is True)
+
+    return frozenset(excluded_ips)
+
+
 def _fast_dandi_reduce_raw_s3_log_line(
     *,
     raw_s3_log_line: str,
     operation_type: str,  # Should be the literal of types, but simplifying for speed here
-    excluded_ips: collections.defaultdict[str, bool],
-    task_id: str,
+    excluded_ips: frozenset[str],
+    errors_buffer: collections.defaultdict[str, list[str]],
 ) -> str | None:
     """
     A faster version of the parsing that makes restrictive but relatively safe assumptions about the line format.
@@ -168,16 +212,18 @@ def _fast_dandi_reduce_raw_s3_log_line(
     We trust here that various fields will exist at precise and regular positions in the string split by spaces.
     """
     try:
-        split_by_space = raw_s3_log_line.split(" ")
-
-        ip_address = split_by_space[4]
-        if excluded_ips[ip_address] is True:
-            return None
+        # Only the leading fields are needed, so stop splitting once the object key has been separated
+        split_by_space = raw_s3_log_line.split(" ", 9)
 
+        # Most lines are of another operation type, so check it first; truncated lines still raise and are reported
         line_operation_type = split_by_space[7]
         if line_operation_type != operation_type:
             return None
 
+        ip_address = split_by_space[4]
+        if ip_address in excluded_ips:
+            return None
+
         full_object_key = split_by_space[8]
         full_object_key_split_by_slash = full_object_key.split("/")
         object_key_parent = full_object_key_split_by_slash[0]
@@ -189,10 +235,11 @@ def _fast_dandi_reduce_raw_s3_log_line(
             case _:
                 return None
 
-        first_post_quote_block = raw_s3_log_line.split('" ')[1].split(" ")
+        first_post_quote_block = raw_s3_log_line.split('" ', 2)[1].split(" ")
         http_status_code = first_post_quote_block[0]
         bytes_sent = first_post_quote_block[2]
-        if http_status_code.isdigit() and len(http_status_code) == 3 and http_status_code[0] != "2":
+        # Test the leading character first so that the common 200-block lines skip the full digit scan
+        if http_status_code[:1] != "2" and len(http_status_code) == 3 and http_status_code.isdigit():
             return None
         elif len(first_post_quote_block) != 7 or not http_status_code.isdigit() or not bytes_sent.isdigit():
             from ._dandi_s3_log_file_reducer import _get_default_dandi_object_key_handler
@@ -202,11 +249,11 @@ def _fast_dandi_reduce_raw_s3_log_line(
                 operation_type=operation_type,
                 excluded_ips=excluded_ips,
                 object_key_handler=_get_default_dandi_object_key_handler(),
-                task_id=task_id,
+                errors_buffer=errors_buffer,
             )
 
         # Forget about timezone for fast case
-        timestamp = datetime.datetime.strptime("".join(split_by_space[2:3]), "[%d/%b/%Y:%H:%M:%S").isoformat()
+        timestamp = _get_iso_timestamp(timestamp=split_by_space[2][1:])
 
         reduced_s3_log_line = f"{timestamp}\t{ip_address}\t{object_key}\t{bytes_sent}\n"
 
@@ -217,7 +264,7 @@ def _fast_dandi_reduce_raw_s3_log_line(
             f"{type(exception)}: {exception}\n"
             f"{traceback.format_exc()}"
         )
-        _collect_error(message=message, error_type="fast_line_reduction", task_id=task_id)
+        errors_buffer["fast_line_reduction"].append(message)
 
         return None
 
@@ -226,18 +273,26 @@ def _reduce_raw_s3_log_line(
     *,
     raw_s3_log_line: str,
     operation_type: str,
-    excluded_ips: collections.defaultdict[str, bool],
+    excluded_ips: frozenset[str],
     object_key_handler: Callable,
-    task_id: str,
+    errors_buffer: collections.defaultdict[str, list[str]],
 ) -> str | None:
+    # Most lines are of another (known) operation type; peek at the operation field to skip them before paying for a
+    # full parse, while malformed lines and unknown operation types still go through validation below
+    split_by_space = raw_s3_log_line.split(" ", 8)
+    if len(split_by_space) > 7:
+        raw_operation_type = split_by_space[7]
+        if raw_operation_type != operation_type and raw_operation_type in _KNOWN_OPERATION_TYPES_SET:
+            return None
+
     try:
         parsed_s3_log_line = _parse_s3_log_line(raw_s3_log_line=raw_s3_log_line)
         full_log_line = _get_full_log_line(parsed_s3_log_line=parsed_s3_log_line)
     except Exception as exception:
         message = (
-            f"Error parsing line: {raw_s3_log_line}\n" f"{type(exception)}: {exception}\n" f"{traceback.format_exc()}",
+            f"Error parsing line: {raw_s3_log_line}\n" f"{type(exception)}: {exception}\n" f"{traceback.format_exc()}"
         )
-        _collect_error(message=message, error_type="line_reduction", task_id=task_id)
+        errors_buffer["line_reduction"].append(message)
 
         return None
 
@@ -245,49 +300,53 @@ def _reduce_raw_s3_log_line(
     # Dump information to a log file in the base folder for easy sharing
     if full_log_line is None:
         message = f"Error during parsing of line '{raw_s3_log_line}'"
-        _collect_error(message=message, error_type="line")
+        errors_buffer["line"].append(message)
         return None
 
+    http_status_code = full_log_line[_HTTP_STATUS_CODE_INDEX]
+    line_operation_type = full_log_line[_OPERATION_INDEX]
+    timestamp = full_log_line[_TIMESTAMP_INDEX]
+    ip_address = full_log_line[_IP_ADDRESS_INDEX]
+
     # Apply some minimal validation and contribute any invalidations to error collection
     # These might slow parsing down a bit, but could be important to ensuring accuracy
-    if not full_log_line.http_status_code.isdigit():
-        message = f"Unexpected status code: '{full_log_line.http_status_code}' parsed from line '{raw_s3_log_line}'."
-        _collect_error(message=message, error_type="line", task_id=task_id)
+    if not http_status_code.isdigit():
+        message = f"Unexpected status code: '{http_status_code}' parsed from line '{raw_s3_log_line}'."
+        errors_buffer["line"].append(message)
 
         return None
 
-    if _IS_OPERATION_TYPE_KNOWN[full_log_line.operation] is False:
-        message = f"Unexpected request type: '{full_log_line.operation}' parsed from line '{raw_s3_log_line}'."
-        _collect_error(message=message, error_type="line", task_id=task_id)
+    if line_operation_type not in _KNOWN_OPERATION_TYPES_SET:
+        message = f"Unexpected request type: '{line_operation_type}' parsed from line '{raw_s3_log_line}'."
+        errors_buffer["line"].append(message)
 
         return None
 
-    timezone = full_log_line.timestamp[-5:]
+    timezone = timestamp[-5:]
     is_timezone_utc = timezone != "+0000"
     if is_timezone_utc:
         message = f"Unexpected time shift parsed from line '{raw_s3_log_line}'."
-        _collect_error(message=message, error_type="line", task_id=task_id)
+        errors_buffer["line"].append(message)
         # Fine to proceed; just wanted to be made aware if there is ever a difference so can try to investigate why
 
     # More early skip conditions after validation
     # Only accept 200-block status codes
-    if full_log_line.http_status_code[0] != "2":
+    if http_status_code[0] != "2":
         return None
 
-    if full_log_line.operation != operation_type:
+    if line_operation_type != operation_type:
         return None
 
-    if excluded_ips[full_log_line.ip_address] is True:
+    if ip_address in excluded_ips:
         return None
 
     # All early skip conditions done; the line is parsed so bin the reduced information by handled asset ID
-    handled_object_key = object_key_handler(object_key=full_log_line.object_key)
-    handled_timestamp = datetime.datetime.strptime(full_log_line.timestamp[:-6], "%d/%b/%Y:%H:%M:%S").isoformat()
-    handled_bytes_sent = int(full_log_line.bytes_sent) if full_log_line.bytes_sent != "-" else 0
+    bytes_sent = full_log_line[_BYTES_SENT_INDEX]
+    handled_object_key = object_key_handler(object_key=full_log_line[_OBJECT_KEY_INDEX])
+    handled_timestamp = _get_iso_timestamp(timestamp=timestamp[:-6])
+    handled_bytes_sent = int(bytes_sent) if bytes_sent != "-" else 0
 
     # TODO: generalize this
-    reduced_s3_log_line = (
-        f"{handled_timestamp}\t{full_log_line.ip_address}\t{handled_object_key}\t{handled_bytes_sent}\n"
-    )
+    reduced_s3_log_line = f"{handled_timestamp}\t{ip_address}\t{handled_object_key}\t{handled_bytes_sent}\n"
 
     return reduced_s3_log_line
@@ -1,8 +1,11 @@
 """Primary functions for parsing a single line of a raw S3 log."""
 
+import datetime
+import functools
+
 from ._globals import (
+    _MONTH_ABBREVIATION_TO_ZERO_PADDED_NUMBER,
     _S3_LOG_REGEX,
-    _FullLogLine,
 )
 
 
@@ -12,8 +15,12 @@ def _parse_s3_log_line(*, raw_s3_log_line: str) -> list[str]:
 
     Bad lines reported in https://github.com/catalystneuro/dandi_s3_log_parser/issues/18 led to quote scrubbing
     as a pre-step. No self-contained single regex was found that could account for this uncorrected strings.
+
+    Well-formed lines are split by `_tokenize_s3_log_line`; the regex is only used for lines it declines.
     """
-    parsed_log_line = [a or b or c for a, b, c in _S3_LOG_REGEX.findall(string=raw_s3_log_line)]
+    parsed_log_line = _tokenize_s3_log_line(raw_s3_log_line=raw_s3_log_line)
+    if parsed_log_line is None:
+        parsed_log_line = [a or b or c for a, b, c in _S3_LOG_REGEX.findall(string=raw_s3_log_line)]
 
     number_of_parsed_items = len(parsed_log_line)
 
@@ -29,6 +36,57 @@ def _parse_s3_log_line(*, raw_s3_log_line: str) -> list[str]:
     return parsed_log_line
 
 
+def _tokenize_s3_log_line(*, raw_s3_log_line: str) -> list[str] | None:
+    """
+    Split a raw line of an S3 log file into the same items as `_S3_LOG_REGEX`, but using only C-level string methods.
+
+    The line is first split on quotes, so that every odd segment is the content of a quoted field, and the remaining
+    segments are split on spaces (with special handling of the single bracketed timestamp).
+
+    Returns None whenever the structure of the line is not one this shortcut is guaranteed to agree with the regex on
+    (unbalanced or empty quotes, quotes or brackets that do not start a field, multiple brackets, etc.).
+    """
+    segments = raw_s3_log_line.split('"')
+    last_segment_index = len(segments) - 1
+
+    # An odd number of quotes means some field was not closed properly
+    if last_segment_index % 2 == 1:
+        return None
+
+    parsed_log_line = []
+    for segment_index, segment in enumerate(segments):
+        if segment_index % 2 == 1:
+            if segment == "":
+                return None
+
+            parsed_log_line.append(segment)
+            continue
+
+        # An opening quote must start a new field; otherwise the regex would have absorbed it into an unquoted item
+        if segment_index != last_segment_index and segment != "" and segment[-1] != " ":
+            return None
+
+        if "[" not in segment:
+            parsed_log_line.extend(filter(None, segment.split(" ")))
+            continue
+
+        before_bracket, _, remainder = segment.partition("[")
+        inside_bracket, closing_bracket, after_bracket = remainder.partition("]")
+        if (
+            (before_bracket != "" and before_bracket[-1] != " ")
+            or inside_bracket == ""
+            or closing_bracket == ""
+            or "[" in remainder
+        ):
+            return None
+
+        parsed_log_line.extend(filter(None, before_bracket.split(" ")))
+        parsed_log_line.append(inside_bracket)
+        parsed_log_line.extend(filter(None, after_bracket.split(" ")))
+
+    return parsed_log_line
+
+
 def _attempt_to_remove_quotes(*, raw_s3_log_line: str, bad_parsed_line: str) -> str:
     """
     Attempt to remove bad quotes from a raw line of an S3 log file.
@@ -45,31 +103,23 @@ def _attempt_to_remove_quotes(*, raw_s3_log_line: str, bad_parsed_line: str) ->
     if len(starting_quotes_indices) != len(ending_quotes_indices):  # pragma: no cover
         return bad_parsed_line
 
-    cleaned_raw_s3_log_line = raw_s3_log_line[0 : starting_quotes_indices[0]]
-    for counter in range(1, len(starting_quotes_indices) - 1):
-        next_block = raw_s3_log_line[ending_quotes_indices[counter - 1] + 2 : starting_quotes_indices[counter]]
-        cleaned_raw_s3_log_line += " - " + next_block
-    cleaned_raw_s3_log_line += " - " + raw_s3_log_line[ending_quotes_indices[-1] + 2 :]
+    # Collect the blocks between quoted fields and join once, rather than rebuilding the string on every addition
+    blocks_between_quotes = [raw_s3_log_line[0 : starting_quotes_indices[0]]]
+    blocks_between_quotes.extend(
+        raw_s3_log_line[ending_quotes_indices[counter - 1] + 2 : starting_quotes_indices[counter]]
+        for counter in range(1, len(starting_quotes_indices) - 1)
+    )
+    blocks_between_quotes.append(raw_s3_log_line[ending_quotes_indices[-1] + 2 :])
+    cleaned_raw_s3_log_line = " - ".join(blocks_between_quotes)
 
     return cleaned_raw_s3_log_line
 
 
 def _find_all_possible_substring_indices(*, string: str, substring: str) -> list[int]:
     indices = list()
-    start = 0
-    max_iter = 10**6
-    while True and start < max_iter:
-        next_index = string.find(substring, start)
-        if next_index == -1:  # .find(...) was unable to locate the substring
-            break
+    next_index = -1
+    while (next_index := string.find(substring, next_index + 1)) != -1:
         indices.append(next_index)
-        start = next_index + 1
-
-    if start >= max_iter:
-        message = (
-            f"Exceeded maximum iterations in `_find_all_possible_substring_indices` on `{string=}` with `{substring=}`."
-        )
-        raise StopIteration(message)
 
     return indices
 
@@ -77,21 +127,51 @@ def _find_all_possible_substring_indices(*, string: str, substring: str) -> list
 def _get_full_log_line(
     *,
     parsed_s3_log_line: list[str],
-) -> _FullLogLine:
+) -> list[str]:
+    """
+    Pad a parsed line to the full number of S3 log fields.
+
+    The result is indexed directly (see the `_..._INDEX` constants in `_globals`) rather than wrapped in a named tuple.
+    """
     number_of_parsed_items = len(parsed_s3_log_line)
-    match number_of_parsed_items:
-        # Seen in a few good lines; don't know why some fields are not detected
-        case 24:
-            parsed_s3_log_line.append("-")
-            parsed_s3_log_line.append("-")
-            return _FullLogLine(*parsed_s3_log_line)
-        # Expected length for most good lines, don't know why they don't include the extra piece on the end
-        case 25:
-            parsed_s3_log_line.append("-")
-            return _FullLogLine(*parsed_s3_log_line)
-        case 26:
-            return _FullLogLine(*parsed_s3_log_line)
-        case _:
-            raise ValueError(
-                f"Unexpected number of parsed items: {number_of_parsed_items}. Parsed line: {parsed_s3_log_line}"
-            )
+
+    # Plain comparisons ordered by frequency, rather than a `match`, since this runs for every parsed line
+    # Expected length for most good lines, don't know why they don't include the extra piece on the end
+    if number_of_parsed_items == 25:
+        parsed_s3_log_line.append("-")
+        return parsed_s3_log_line
+    if number_of_parsed_items == 26:
+        return parsed_s3_log_line
+    # Seen in a few good lines; don't know why some fields are not detected
+    if number_of_parsed_items == 24:
+        parsed_s3_log_line.append("-")
+        parsed_s3_log_line.append("-")
+        return parsed_s3_log_line
+
+    raise ValueError(f"Unexpected number of parsed items: {number_of_parsed_items}. Parsed line: {parsed_s3_log_line}")
+
+
+# Many requests share the same second; a daily log can contain at most 86,400 distinct timestamps
+@functools.lru_cache(maxsize=86_400)
+def _get_iso_timestamp(*, timestamp: str) -> str:
+    """
+    Convert the timestamp of a line of an S3 log file, stripped of its brackets and time zone, to ISO 8601 form.
+
+    S3 timestamps are always written in the fixed-width form '01/Jan/2020:05:06:35', so the fields can be sliced out
+    and rearranged directly into '2020-01-01T05:06:35'. For any timestamp of that form, this is the same string that
+    `datetime.datetime.strptime(timestamp, "%d/%b/%Y:%H:%M:%S").isoformat()` produces; any other input raises a
+    ValueError, as `strptime` would.
+    """
+    # The separators are checked explicitly since slicing alone would silently accept misaligned fields
+    if len(timestamp) != 20 or timestamp[2] + timestamp[6] + timestamp[11] + timestamp[14] + timestamp[17] != "//:::":
+        raise ValueError(f"Unexpected timestamp format: '{timestamp}'.")
+
+    month = _MONTH_ABBREVIATION_TO_ZERO_PADDED_NUMBER.get(timestamp[3:6])
+    if month is None:
+        raise ValueError(f"Unexpected month in timestamp: '{timestamp}'.")
+    iso_timestamp = f"{timestamp[7:11]}-{month}-{timestamp[0:2]}T{timestamp[12:20]}"
+
+    # Only constructed for validation (e.g., out of range days or hours), which `strptime` used to provide
+    datetime.datetime.fromisoformat(iso_timestamp)
+
+    return iso_timestamp
@@ -1,9 +1,9 @@
 """Collection of helper functions related to testing and generating of example lines."""
 
-import collections
 import hashlib
 import pathlib
 import random
+from collections.abc import Iterator
 from typing import Literal
 
 import tqdm
@@ -29,77 +29,77 @@ def find_random_example_line(
     request_type : string
         The type of request to filter for.
     maximum_lines_per_request_type : integer
-        The maximum number of lines to randomly sample for each request type.
+        The maximum number of lines of the requested type to scan before one of them is chosen.
         The default is 5.
 
-        These lines are always found chronologically from the start of the file.
+        Files are visited in a random order, but the lines within each are always scanned from the start of the file.
     seed : int
         The seed to use for the random number generator.
+        The same seed always returns the same line; the global `random` state is left untouched.
 
     """
+    # Otherwise an unknown request type would only be reported after scanning every file in the folder
+    if request_type not in REQUEST_TYPES:
+        message = f"Request type ('{request_type}') is not one of the known types: {REQUEST_TYPES}!"
+        raise ValueError(message)
+
     raw_s3_log_folder_path = pathlib.Path(raw_s3_log_folder_path)
 
     all_raw_s3_log_file_paths = list(raw_s3_log_folder_path.rglob(pattern="*.log"))
 
-    random.seed(seed)
-    random.shuffle(all_raw_s3_log_file_paths)
-
-    lines_by_request_type = collections.defaultdict(list)
-    running_counts_by_request_type = collections.defaultdict(int)
-
-    # Unsafe - but possibly faster
-    # for random_log_file_path in all_raw_s3_log_file_paths:
-    #     with open(file=random_log_file_path, mode="r") as io:
-    #         all_lines = io.readlines()
-    #
-    #     # 170 is just an estimation
-    #     # Unsafe: Might not have parsed 7+ elements from " " split
-    #     # Unsafe: Might not have parsed 1+ elements from second "." split
-    #     estimated_request_type_by_line = [line[:170].split(" ")[7].split(".")[1] for line in all_lines]
-    #     for line_index, estimated_request_type in enumerate(estimated_request_type_by_line):
-    #         lines_by_request_type[estimated_request_type].append(all_lines[line_index])
-    #         running_counts_by_request_type[estimated_request_type] += 1
-    #
-    #         if running_counts_by_request_type[request_type] > maximum_lines_per_request_type:
-    #             break
-    #     if running_counts_by_request_type[request_type] > maximum_lines_per_request_type:
-    #         break
-
-    # Safe - but possibly slower
-    for random_log_file_path in all_raw_s3_log_file_paths:
-        with open(file=random_log_file_path) as io:
-            all_lines = io.readlines()
-
-        # 170 is just an estimation
-        sublines_items = [line[:170].split(" ") for line in all_lines]
-        for line_index, subline_items in enumerate(sublines_items):
-            # If line is as expected, some type of REST query should be at index 7
-            if len(subline_items) < 8:
-                continue
-
-            # Result at this point should appear as something like 'REST.GET.OBJECT'
-            raw_request_line = subline_items[7].split(".")
-            if len(raw_request_line) != 3:
-                raise ValueError(f"Bad request line found: {raw_request_line}")
-            if raw_request_line[2] != "OBJECT":
-                continue
-            estimated_request_type = raw_request_line[1]
-
-            lines_by_request_type[estimated_request_type].append(all_lines[line_index])
-            running_counts_by_request_type[estimated_request_type] += 1
-
-            if running_counts_by_request_type[request_type] > maximum_lines_per_request_type:
-                break
-
-        print(
-            f"No lines found for request type ('{request_type}') in file '{random_log_file_path}'! "
-            "Scanning the next file...",
-        )
-
-        if running_counts_by_request_type[request_type] > maximum_lines_per_request_type:
+    # A dedicated generator avoids reseeding (and thereby altering) the global random state of the caller
+    random_number_generator = random.Random(seed)
+
+    # Only lines of the requested type are counted; other request types are skipped without further work
+    encoded_request_type = request_type.encode()
+
+    # Reservoir sampling (of size one) keeps only the currently chosen line, rather than all matching lines
+    sampled_line = None
+    running_count = 0
+
+    for random_log_file_path in _iterate_in_random_order(
+        items=all_raw_s3_log_file_paths, random_number_generator=random_number_generator
+    ):
+        previous_count = running_count
+
+        # Stream the lines so that scanning can stop as soon as enough examples are found
+        # Lines are read as bytes and only decoded once they are kept
+        with open(file=random_log_file_path, mode="rb") as io:
+            for line in io:
+                # 170 is just an estimation; the splits are bounded since only the request field is needed
+                subline_items = line[:170].split(b" ", 8)
+
+                # If line is as expected, some type of REST query should be at index 7
+                if len(subline_items) < 8:
+                    continue
+
+                # Result at this point should appear as something like 'REST.GET.OBJECT'
+                raw_request_line = subline_items[7].split(b".", 2)
+                if len(raw_request_line) != 3:
+                    raise ValueError(f"Bad request line found: {[item.decode() for item in raw_request_line]}")
+                if raw_request_line[2] != b"OBJECT" or raw_request_line[1] != encoded_request_type:
+                    continue
+
+                running_count += 1
+                if random_number_generator.randint(1, running_count) == 1:
+                    sampled_line = line.decode()
+
+                if running_count > maximum_lines_per_request_type:
+                    break
+
+        if running_count == previous_count:
+            print(
+                f"No lines found for request type ('{request_type}') in file '{random_log_file_path}'! "
+                "Scanning the next file...",
+            )
+
+        if running_count > maximum_lines_per_request_type:
             break
 
-    random_line = random.choice(seq=lines_by_request_type[request_type])
+    if sampled_line is None:
+        message = f"No lines found for request type ('{request_type}') in folder '{raw_s3_log_folder_path}'!"
+        raise ValueError(message)
+    random_line = sampled_line
 
     # Replace IP information with placeholders
     random_line_items = random_line.split(" ")
@@ -126,7 +126,8 @@ def get_hash_salt(base_raw_s3_log_folder_path: FilePath) -> str:
     with open(file=first_log_file_path) as io:
         first_line = io.readline()
 
-    hash_salt = hashlib.sha1(string=bytes(first_line, "utf-8"))
+    # SHA1 is kept so that the salt (and therefore every cached IP hash) stays the same as before
+    hash_salt = hashlib.sha1(string=first_line.encode("utf-8"))
 
     return hash_salt.hexdigest()
 
@@ -153,7 +154,8 @@ def find_all_known_operation_types(
         smoothing=0,
     ):
         operation_types_per_file = {
-            raw_log_line.split(" ")[7]
+            # Bounded split; only the fields up to the operation are needed
+            raw_log_line.split(" ", 8)[7]
             for buffered_text_reader in BufferedTextReader(file_path=raw_s3_log_file_path)
             for raw_log_line in buffered_text_reader
         }
@@ -161,3 +163,16 @@ def find_all_known_operation_types(
         unique_operation_types.update(operation_types_per_file)
 
     return unique_operation_types
+
+
+def _iterate_in_random_order(*, items: list, random_number_generator: random.Random) -> Iterator:
+    """
+    Yield the items in a random order, shuffling in place only as far as the iteration actually proceeds.
+
+    This is a lazy Fisher-Yates shuffle; stopping early skips the random draws for all remaining items.
+    """
+    for index in range(len(items) - 1, -1, -1):
+        random_index = random_number_generator.randint(0, index)
+        items[index], items[random_index] = items[random_index], items[index]
+
+        yield items[index]
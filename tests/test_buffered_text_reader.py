@@ -1,5 +1,4 @@
 import pathlib
-import sys
 
 import pytest
 
@@ -14,10 +13,9 @@ def large_text_file_path(tmp_path_factory: pytest.TempPathFactory) -> pathlib.Pa
     # Generate a test file ~10 MB in total size
     # Content does not matter, each line is ~100 bytes
     test_file_path = tmp_path / "large_text_file.txt"
-    fill_string = "a" * 60 + "\n"
-    content = [fill_string for _ in range(10**5)]
-    with open(file=test_file_path, mode="w") as test_file:
-        test_file.writelines(content)
+    content = (b"a" * 60 + b"\n") * 10**5
+    with open(file=test_file_path, mode="wb") as test_file:
+        test_file.write(content)
 
     return test_file_path
 
@@ -29,8 +27,8 @@ def single_line_text_file_path(tmp_path_factory: pytest.TempPathFactory) -> path
 
     # Generate test file ~3 MB in total size, consisting of only a single line
     test_file_path = tmp_path / "single_line_text_file.txt"
-    with open(file=test_file_path, mode="w") as test_file:
-        test_file.write("a" * 30**6)
+    with open(file=test_file_path, mode="wb") as test_file:
+        test_file.write(b"a" * 30**6)
 
     return test_file_path
 
@@ -47,8 +45,10 @@ def test_buffered_text_reader(large_text_file_path: pathlib.Path):
 
     for buffer_index, buffer in enumerate(buffered_text_reader):
         assert isinstance(buffer, list), "BufferedTextReader object did not load a buffer as a list!"
+        # Measure the text held in the buffer, including the newline stripped from each line; `sys.getsizeof` would
+        # only count the list of references
         assert (
-            sys.getsizeof(buffer) <= buffered_text_reader.buffer_size_in_bytes
+            sum(len(line) + 1 for line in buffer) <= buffered_text_reader.buffer_size_in_bytes
         ), "BufferedTextReader object loaded a buffer exceeding the threshold!"
 
     assert buffer_index == 18, "BufferedTextReader object did not load the correct number of buffers!"
@@ -0,0 +1,46 @@
+import pathlib
+import random
+
+import pytest
+
+import dandi_s3_log_parser.testing
+
+EXAMPLES_FOLDER_PATH = pathlib.Path(__file__).parent / "test_reduction" / "examples"
+
+
+def test_find_random_example_line_is_reproducible() -> None:
+    first_line = dandi_s3_log_parser.testing.find_random_example_line(
+        raw_s3_log_folder_path=EXAMPLES_FOLDER_PATH, request_type="GET", seed=0
+    )
+    second_line = dandi_s3_log_parser.testing.find_random_example_line(
+        raw_s3_log_folder_path=EXAMPLES_FOLDER_PATH, request_type="GET", seed=0
+    )
+
+    assert first_line == second_line
+    assert " REST.GET.OBJECT " in first_line
+    assert first_line.split(" ")[4] == "192.0.2.0"
+
+
+def test_find_random_example_line_leaves_global_random_state_untouched() -> None:
+    global_random_state = random.getstate()
+
+    dandi_s3_log_parser.testing.find_random_example_line(
+        raw_s3_log_folder_path=EXAMPLES_FOLDER_PATH, request_type="GET", seed=0
+    )
+
+    assert random.getstate() == global_random_state
+
+
+def test_find_random_example_line_unknown_request_type() -> None:
+    with pytest.raises(ValueError, match="is not one of the known types"):
+        dandi_s3_log_parser.testing.find_random_example_line(
+            raw_s3_log_folder_path=EXAMPLES_FOLDER_PATH, request_type="POST"
+        )
+
+
+def test_find_random_example_line_no_matching_lines() -> None:
+    # The examples only contain GET requests
+    with pytest.raises(ValueError, match="No lines found for request type"):
+        dandi_s3_log_parser.testing.find_random_example_line(
+            raw_s3_log_folder_path=EXAMPLES_FOLDER_PATH, request_type="PUT"
+        )
@@ -1,23 +1,19 @@
 import pathlib
-
-import pandas
-import py
+from collections.abc import Callable
 
 import dandi_s3_log_parser
 
+EXAMPLE_FOLDER_PATH = pathlib.Path(__file__).parent / "examples" / "reduction_example_1"
 
-def test_reduce_all_dandi_raw_s3_logs_example_1(tmpdir: py.path.local) -> None:
-    """Basic test for parsing of all DANDI raw S3 logs in a directory."""
-    tmpdir = pathlib.Path(tmpdir)
 
-    file_parent = pathlib.Path(__file__).parent
-    example_folder_path = file_parent / "examples" / "reduction_example_1"
-    example_raw_s3_logs_folder_path = example_folder_path / "raw_logs"
+def test_reduce_all_dandi_raw_s3_logs_example_1(tmp_path: pathlib.Path, assert_tsv_files_equal: Callable) -> None:
+    """Basic test for parsing of all DANDI raw S3 logs in a directory."""
+    example_raw_s3_logs_folder_path = EXAMPLE_FOLDER_PATH / "raw_logs"
 
-    test_reduced_s3_logs_folder_path = tmpdir / "reduction_example_1"
+    test_reduced_s3_logs_folder_path = tmp_path / "reduction_example_1"
     test_reduced_s3_logs_folder_path.mkdir(exist_ok=True)
 
-    expected_reduced_s3_logs_folder_path = example_folder_path / "expected_output"
+    expected_reduced_s3_logs_folder_path = EXAMPLE_FOLDER_PATH / "expected_output"
 
     dandi_s3_log_parser.reduce_all_dandi_raw_s3_logs(
         raw_s3_logs_folder_path=example_raw_s3_logs_folder_path,
@@ -36,19 +32,17 @@ def test_reduce_all_dandi_raw_s3_logs_example_1(tmpdir: py.path.local) -> None:
     test_reduced_s3_log_file_path = test_reduced_s3_logs_folder_path / "2020" / "01" / "01.tsv"
     expected_reduced_s3_log_file_path = expected_reduced_s3_logs_folder_path / "2020" / "01" / "01.tsv"
 
-    test_reduced_s3_log = pandas.read_table(filepath_or_buffer=test_reduced_s3_log_file_path)
-    expected_reduced_s3_log = pandas.read_table(filepath_or_buffer=expected_reduced_s3_log_file_path)
-
-    pandas.testing.assert_frame_equal(left=test_reduced_s3_log, right=expected_reduced_s3_log)
+    assert_tsv_files_equal(
+        test_file_path=test_reduced_s3_log_file_path, expected_file_path=expected_reduced_s3_log_file_path
+    )
 
     # Second file
     test_reduced_s3_log_file_path = test_reduced_s3_logs_folder_path / "2021" / "02" / "03.tsv"
     expected_reduced_s3_log_file_path = expected_reduced_s3_logs_folder_path / "2021" / "02" / "03.tsv"
 
-    test_reduced_s3_log = pandas.read_table(filepath_or_buffer=test_reduced_s3_log_file_path)
-    expected_reduced_s3_log = pandas.read_table(filepath_or_buffer=expected_reduced_s3_log_file_path)
-
-    pandas.testing.assert_frame_equal(left=test_reduced_s3_log, right=expected_reduced_s3_log)
+    assert_tsv_files_equal(
+        test_file_path=test_reduced_s3_log_file_path, expected_file_path=expected_reduced_s3_log_file_path
+    )
 
 
 # TODO: add CLI
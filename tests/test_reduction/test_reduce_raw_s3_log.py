@@ -1,29 +1,29 @@
+import collections
 import pathlib
+from collections.abc import Callable
 
-import pandas
-import py
+import pydantic
+import pytest
 
 import dandi_s3_log_parser
 
+EXAMPLE_FOLDER_PATH = pathlib.Path(__file__).parent / "examples" / "reduction_example_0"
 
-def test_reduce_raw_s3_log_example_0_fast_case(tmpdir: py.path.local) -> None:
+
+def test_reduce_raw_s3_log_example_0_fast_case(tmp_path: pathlib.Path, assert_tsv_files_equal: Callable) -> None:
     """
     Most basic test of functionality.
 
     If there are failures in the parsing of any lines found in application,
     please raise an issue and contribute them to the example log collection.
     """
-    tmpdir = pathlib.Path(tmpdir)
-
-    file_parent = pathlib.Path(__file__).parent
-    example_folder_path = file_parent / "examples" / "reduction_example_0"
-    example_raw_s3_log_file_path = example_folder_path / "raw_logs" / "2020" / "01" / "01.log"
+    example_raw_s3_log_file_path = EXAMPLE_FOLDER_PATH / "raw_logs" / "2020" / "01" / "01.log"
 
-    test_reduced_s3_logs_folder_path = tmpdir / "reduced_example_0_fast_case"
+    test_reduced_s3_logs_folder_path = tmp_path / "reduced_example_0_fast_case"
     test_reduced_s3_log_file_path = test_reduced_s3_logs_folder_path / "2020" / "01" / "01.tsv"
     test_reduced_s3_log_file_path.parent.mkdir(parents=True, exist_ok=True)
 
-    expected_reduced_s3_logs_folder_path = example_folder_path / "expected_output"
+    expected_reduced_s3_logs_folder_path = EXAMPLE_FOLDER_PATH / "expected_output"
     expected_reduced_s3_log_file_path = expected_reduced_s3_logs_folder_path / "2020" / "01" / "01.tsv"
 
     dandi_s3_log_parser.reduce_raw_s3_log(
@@ -34,24 +34,19 @@ def test_reduce_raw_s3_log_example_0_fast_case(tmpdir: py.path.local) -> None:
         object_key_parents_to_reduce=["blobs", "zarr"],
     )
 
-    test_reduced_s3_log = pandas.read_table(filepath_or_buffer=test_reduced_s3_log_file_path)
-    expected_reduced_s3_log = pandas.read_table(filepath_or_buffer=expected_reduced_s3_log_file_path)
-
-    pandas.testing.assert_frame_equal(left=test_reduced_s3_log, right=expected_reduced_s3_log)
-
+    assert_tsv_files_equal(
+        test_file_path=test_reduced_s3_log_file_path, expected_file_path=expected_reduced_s3_log_file_path
+    )
 
-def test_reduce_raw_s3_log_example_0_basic_case(tmpdir: py.path.local) -> None:
-    tmpdir = pathlib.Path(tmpdir)
 
-    file_parent = pathlib.Path(__file__).parent
-    example_folder_path = file_parent / "examples" / "reduction_example_0"
-    example_raw_s3_log_file_path = example_folder_path / "raw_logs" / "2020" / "01" / "01.log"
+def test_reduce_raw_s3_log_example_0_basic_case(tmp_path: pathlib.Path, assert_tsv_files_equal: Callable) -> None:
+    example_raw_s3_log_file_path = EXAMPLE_FOLDER_PATH / "raw_logs" / "2020" / "01" / "01.log"
 
-    test_reduced_s3_logs_folder_path = tmpdir / "reduced_example_0_basic_case"
+    test_reduced_s3_logs_folder_path = tmp_path / "reduced_example_0_basic_case"
     test_reduced_s3_log_file_path = test_reduced_s3_logs_folder_path / "2020" / "01" / "01.tsv"
     test_reduced_s3_log_file_path.parent.mkdir(parents=True, exist_ok=True)
 
-    expected_reduced_s3_logs_folder_path = example_folder_path / "expected_output"
+    expected_reduced_s3_logs_folder_path = EXAMPLE_FOLDER_PATH / "expected_output"
     expected_reduced_s3_log_file_path = expected_reduced_s3_logs_folder_path / "2020" / "01" / "01.tsv"
 
     object_key_handler = dandi_s3_log_parser._dandi_s3_log_file_reducer._get_default_dandi_object_key_handler()
@@ -62,7 +57,49 @@ def test_reduce_raw_s3_log_example_0_basic_case(tmpdir: py.path.local) -> None:
         object_key_handler=object_key_handler,
     )
 
-    test_reduced_s3_log = pandas.read_table(filepath_or_buffer=test_reduced_s3_log_file_path)
-    expected_reduced_s3_log = pandas.read_table(filepath_or_buffer=expected_reduced_s3_log_file_path)
+    assert_tsv_files_equal(
+        test_file_path=test_reduced_s3_log_file_path, expected_file_path=expected_reduced_s3_log_file_path
+    )
+
+
+@pytest.mark.parametrize(
+    "excluded_ips, expected_number_of_reduced_lines",
+    [
+        pytest.param(None, 3, id="none"),
+        pytest.param(frozenset(), 3, id="empty_frozenset"),
+        pytest.param({"192.0.2.0"}, 0, id="set"),
+        pytest.param(["192.0.2.0"], 0, id="list"),
+        pytest.param(collections.defaultdict(bool, {"192.0.2.0": True}), 0, id="lookup_table"),
+        pytest.param({"192.0.2.0": False}, 3, id="lookup_table_with_false_value"),
+    ],
+)
+def test_reduce_raw_s3_log_example_0_excluded_ips(
+    tmp_path: pathlib.Path, excluded_ips: object, expected_number_of_reduced_lines: int
+) -> None:
+    example_raw_s3_log_file_path = EXAMPLE_FOLDER_PATH / "raw_logs" / "2020" / "01" / "01.log"
+    test_reduced_s3_log_file_path = tmp_path / "01.tsv"
+
+    dandi_s3_log_parser.reduce_raw_s3_log(
+        raw_s3_log_file_path=example_raw_s3_log_file_path,
+        reduced_s3_log_file_path=test_reduced_s3_log_file_path,
+        fields_to_reduce=["object_key", "timestamp", "bytes_sent", "ip_address"],
+        object_key_parents_to_reduce=["blobs", "zarr"],
+        excluded_ips=excluded_ips,
+    )
+
+    with open(file=test_reduced_s3_log_file_path, mode="r") as io:
+        reduced_s3_log_lines = io.readlines()
+
+    # The header is only written when at least one line is reduced
+    number_of_reduced_lines = max(len(reduced_s3_log_lines) - 1, 0)
+    assert number_of_reduced_lines == expected_number_of_reduced_lines
+
 
-    pandas.testing.assert_frame_equal(left=test_reduced_s3_log, right=expected_reduced_s3_log)
+def test_reduce_raw_s3_log_excluded_ips_rejects_string(tmp_path: pathlib.Path) -> None:
+    """A single string would otherwise be interpreted as a collection of its characters."""
+    with pytest.raises(pydantic.ValidationError):
+        dandi_s3_log_parser.reduce_raw_s3_log(
+            raw_s3_log_file_path=EXAMPLE_FOLDER_PATH / "raw_logs" / "2020" / "01" / "01.log",
+            reduced_s3_log_file_path=tmp_path / "01.tsv",
+            excluded_ips="192.0.2.0",
+        )
@@ -1,28 +1,33 @@
+import collections
+import os
 import pathlib
+from collections.abc import Callable
 
-import pandas
-import py
+import pytest
 
 import dandi_s3_log_parser
 
+EXAMPLE_FOLDER_PATH = pathlib.Path(__file__).parent / "examples" / "reduction_example_2"
 
-def test_reduce_raw_s3_log_example_bad_lines_fast_case(tmpdir: py.path.local) -> None:
-    tmpdir = pathlib.Path(tmpdir)
 
-    # Count initial error folder contents
-    error_folder = dandi_s3_log_parser.DANDI_S3_LOG_PARSER_BASE_FOLDER_PATH / "errors"
-    error_folder_contents = list(error_folder.iterdir()) if error_folder.exists() else list()
-    initial_number_of_error_folder_contents = len(error_folder_contents)
+def _count_error_files() -> int:
+    """Count the entries of the error folder (created on import) without constructing a path for each one."""
+    with os.scandir(dandi_s3_log_parser.DANDI_S3_LOG_PARSER_BASE_FOLDER_PATH / "errors") as error_folder_entries:
+        return sum(1 for _ in error_folder_entries)
 
-    file_parent = pathlib.Path(__file__).parent
-    example_folder_path = file_parent / "examples" / "reduction_example_2"
-    example_raw_s3_log_file_path = example_folder_path / "raw_logs" / "2022" / "04" / "06.log"
 
-    test_reduced_s3_logs_folder_path = tmpdir / "reduced_example_bad_lines_fast_case"
+def test_reduce_raw_s3_log_example_bad_lines_fast_case(
+    tmp_path: pathlib.Path, assert_tsv_files_equal: Callable
+) -> None:
+    initial_number_of_error_folder_contents = _count_error_files()
+
+    example_raw_s3_log_file_path = EXAMPLE_FOLDER_PATH / "raw_logs" / "2022" / "04" / "06.log"
+
+    test_reduced_s3_logs_folder_path = tmp_path / "reduced_example_bad_lines_fast_case"
     test_reduced_s3_log_file_path = test_reduced_s3_logs_folder_path / "2022" / "04" / "06.tsv"
     test_reduced_s3_log_file_path.parent.mkdir(parents=True, exist_ok=True)
 
-    expected_reduced_s3_logs_folder_path = example_folder_path / "expected_output"
+    expected_reduced_s3_logs_folder_path = EXAMPLE_FOLDER_PATH / "expected_output"
     expected_reduced_s3_log_file_path = expected_reduced_s3_logs_folder_path / "2022" / "04" / "06.tsv"
 
     dandi_s3_log_parser.reduce_raw_s3_log(
@@ -33,34 +38,25 @@ def test_reduce_raw_s3_log_example_bad_lines_fast_case(tmpdir: py.path.local) ->
         object_key_parents_to_reduce=["blobs", "zarr"],
     )
 
-    test_reduced_s3_log = pandas.read_table(filepath_or_buffer=test_reduced_s3_log_file_path)
-    expected_reduced_s3_log = pandas.read_table(filepath_or_buffer=expected_reduced_s3_log_file_path)
-
-    pandas.testing.assert_frame_equal(left=test_reduced_s3_log, right=expected_reduced_s3_log)
-
-    post_test_error_folder_contents = list(error_folder.iterdir()) if error_folder.exists() else list()
-    assert (
-        len(post_test_error_folder_contents) == initial_number_of_error_folder_contents
-    ), "Errors occurred during line parsing!"
+    assert_tsv_files_equal(
+        test_file_path=test_reduced_s3_log_file_path, expected_file_path=expected_reduced_s3_log_file_path
+    )
 
+    assert _count_error_files() == initial_number_of_error_folder_contents, "Errors occurred during line parsing!"
 
-def test_reduce_raw_s3_log_example_bad_lines_basic_case(tmpdir: py.path.local) -> None:
-    tmpdir = pathlib.Path(tmpdir)
 
-    # Count initial error folder contents
-    error_folder = dandi_s3_log_parser.DANDI_S3_LOG_PARSER_BASE_FOLDER_PATH / "errors"
-    error_folder_contents = list(error_folder.iterdir()) if error_folder.exists() else list()
-    initial_number_of_error_folder_contents = len(error_folder_contents)
+def test_reduce_raw_s3_log_example_bad_lines_basic_case(
+    tmp_path: pathlib.Path, assert_tsv_files_equal: Callable
+) -> None:
+    initial_number_of_error_folder_contents = _count_error_files()
 
-    file_parent = pathlib.Path(__file__).parent
-    example_folder_path = file_parent / "examples" / "reduction_example_2"
-    example_raw_s3_log_file_path = example_folder_path / "raw_logs" / "2022" / "04" / "06.log"
+    example_raw_s3_log_file_path = EXAMPLE_FOLDER_PATH / "raw_logs" / "2022" / "04" / "06.log"
 
-    test_reduced_s3_logs_folder_path = tmpdir / "reduced_example_bad_lines_basic_case"
+    test_reduced_s3_logs_folder_path = tmp_path / "reduced_example_bad_lines_basic_case"
     test_reduced_s3_log_file_path = test_reduced_s3_logs_folder_path / "2022" / "04" / "06.tsv"
     test_reduced_s3_log_file_path.parent.mkdir(parents=True, exist_ok=True)
 
-    expected_reduced_s3_logs_folder_path = example_folder_path / "expected_output"
+    expected_reduced_s3_logs_folder_path = EXAMPLE_FOLDER_PATH / "expected_output"
     expected_reduced_s3_log_file_path = expected_reduced_s3_logs_folder_path / "2022" / "04" / "06.tsv"
 
     object_key_handler = dandi_s3_log_parser._dandi_s3_log_file_reducer._get_default_dandi_object_key_handler()
@@ -71,12 +67,107 @@ def test_reduce_raw_s3_log_example_bad_lines_basic_case(tmpdir: py.path.local) -
         object_key_handler=object_key_handler,
     )
 
-    test_reduced_s3_log = pandas.read_table(filepath_or_buffer=test_reduced_s3_log_file_path)
-    expected_reduced_s3_log = pandas.read_table(filepath_or_buffer=expected_reduced_s3_log_file_path)
+    assert_tsv_files_equal(
+        test_file_path=test_reduced_s3_log_file_path, expected_file_path=expected_reduced_s3_log_file_path
+    )
+
+    assert _count_error_files() == initial_number_of_error_folder_contents, "Errors occurred during line parsing!"
+
+
+@pytest.mark.parametrize("raw_s3_log_line", ["", "8787a", "8787a dandiarchive [01/Jan/2020:05:06:35 +0000] 192.0.2.0"])
+def test_fast_reduction_of_truncated_line_is_reported(raw_s3_log_line: str) -> None:
+    """Truncated lines must not be dropped silently by the fast reduction path."""
+    errors_buffer = collections.defaultdict(list)
+
+    reduced_s3_log_line = dandi_s3_log_parser._s3_log_file_reducer._fast_dandi_reduce_raw_s3_log_line(
+        raw_s3_log_line=raw_s3_log_line,
+        operation_type="REST.GET.OBJECT",
+        excluded_ips=frozenset(),
+        errors_buffer=errors_buffer,
+    )
+
+    assert reduced_s3_log_line is None
+    assert list(errors_buffer.keys()) == ["fast_line_reduction"]
+    assert len(errors_buffer["fast_line_reduction"]) == 1
 
-    pandas.testing.assert_frame_equal(left=test_reduced_s3_log, right=expected_reduced_s3_log)
 
-    post_test_error_folder_contents = list(error_folder.iterdir()) if error_folder.exists() else list()
-    assert (
-        len(post_test_error_folder_contents) == initial_number_of_error_folder_contents
-    ), "Errors occurred during line parsing!"
+def test_reduction_reports_time_shift_of_unsuccessful_request() -> None:
+    """The time shift diagnostic applies to every parsed line, including those later skipped for their status code."""
+    raw_s3_log_line = (
+        "8787a3c41bf7ce0d54359d9348ad5b08e16bd5bb8ae5aa4e1508b435773a066e dandiarchive [01/Jan/2020:05:06:35 -0500] "
+        "192.0.2.0 - J42N2W7ET0EC03CV REST.GET.OBJECT blobs/11e/c89/11ec8933-1456-4942-922b-94e5878bb991 "
+        '"GET /blobs/11e/c89/11ec8933-1456-4942-922b-94e5878bb991 HTTP/1.1" 404 - 512 171408 53 52 "-" "-" - '
+        "DX8oFoKQx0o5V3lwEuWBxF5p2fSXrwINj0rnxmas0YgjWuPqYLK/vnW60Txh23K93aahe0IFw2c= - ECDHE-RSA-AES128-GCM-SHA256 - "
+        "dandiarchive.s3.amazonaws.com TLSv1.2 -"
+    )
+    errors_buffer = collections.defaultdict(list)
+
+    reduced_s3_log_line = dandi_s3_log_parser._s3_log_file_reducer._reduce_raw_s3_log_line(
+        raw_s3_log_line=raw_s3_log_line,
+        operation_type="REST.GET.OBJECT",
+        excluded_ips=frozenset(),
+        object_key_handler=lambda object_key: object_key,
+        errors_buffer=errors_buffer,
+    )
+
+    assert reduced_s3_log_line is None
+    assert len(errors_buffer["line"]) == 1
+    assert errors_buffer["line"][0].startswith("Unexpected time shift")
+
+
+def test_reduce_raw_s3_log_collects_errors_once_per_type(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Buffered error messages must still reach the errors folder, with a single write per error type."""
+    raw_s3_log_line = (
+        "8787a3c41bf7ce0d54359d9348ad5b08e16bd5bb8ae5aa4e1508b435773a066e dandiarchive [01/Jan/2020:05:06:35 +0000] "
+        "192.0.2.0 - J42N2W7ET0EC03CV REST.GET.OBJECT blobs/11e/c89/11ec8933-1456-4942-922b-94e5878bb991 "
+        '"GET /blobs/11e/c89/11ec8933-1456-4942-922b-94e5878bb991 HTTP/1.1" 200 - 512 171408 53 52 "-" "-" - '
+        "DX8oFoKQx0o5V3lwEuWBxF5p2fSXrwINj0rnxmas0YgjWuPqYLK/vnW60Txh23K93aahe0IFw2c= - ECDHE-RSA-AES128-GCM-SHA256 - "
+        "dandiarchive.s3.amazonaws.com TLSv1.2 -"
+    )
+    time_shifted_raw_s3_log_line = raw_s3_log_line.replace("+0000", "-0500")
+    unknown_operation_raw_s3_log_line = raw_s3_log_line.replace("REST.GET.OBJECT", "REST.FOO.OBJECT")
+
+    example_raw_s3_log_file_path = tmp_path / "raw_logs" / "2020" / "01" / "01.log"
+    example_raw_s3_log_file_path.parent.mkdir(parents=True)
+    with open(file=example_raw_s3_log_file_path, mode="w") as io:
+        io.write(f"{raw_s3_log_line}\n{time_shifted_raw_s3_log_line}\n{unknown_operation_raw_s3_log_line}\n")
+
+    # Redirect the errors to a fresh folder, with a fixed version so that the file name is known in advance
+    test_errors_folder_path = tmp_path / "errors"
+    test_errors_folder_path.mkdir()
+    monkeypatch.setattr(dandi_s3_log_parser._error_collection, "_ERRORS_FOLDER_PATH", test_errors_folder_path)
+    monkeypatch.setattr(dandi_s3_log_parser._error_collection, "_get_dandi_s3_log_parser_version", lambda: "0.0.0")
+
+    collected_error_types = []
+    collect_error = dandi_s3_log_parser._s3_log_file_reducer._collect_error
+
+    def _record_collect_error(*, message: str, error_type: str, task_id: str | None = None) -> None:
+        collected_error_types.append(error_type)
+        collect_error(message=message, error_type=error_type, task_id=task_id)
+
+    monkeypatch.setattr(dandi_s3_log_parser._s3_log_file_reducer, "_collect_error", _record_collect_error)
+
+    test_reduced_s3_log_file_path = tmp_path / "reduced_logs" / "2020" / "01" / "01.tsv"
+    test_reduced_s3_log_file_path.parent.mkdir(parents=True)
+    dandi_s3_log_parser.reduce_raw_s3_log(
+        raw_s3_log_file_path=example_raw_s3_log_file_path,
+        reduced_s3_log_file_path=test_reduced_s3_log_file_path,
+    )
+
+    assert collected_error_types == ["line"]
+
+    error_file_paths = list(test_errors_folder_path.iterdir())
+    assert len(error_file_paths) == 1
+    assert error_file_paths[0].name.startswith("v0.0.0_")
+    assert "_line_errors_" in error_file_paths[0].name
+
+    with open(file=error_file_paths[0], mode="r") as io:
+        error_file_content = io.read()
+
+    expected_error_file_content = (
+        f"Unexpected time shift parsed from line '{time_shifted_raw_s3_log_line}'.\n\n"
+        f"Unexpected request type: 'REST.FOO.OBJECT' parsed from line '{unknown_operation_raw_s3_log_line}'.\n\n"
+    )
+    assert error_file_content == expected_error_file_content
@@ -0,0 +1,88 @@
+import pytest
+
+import dandi_s3_log_parser
+
+BASE_RAW_S3_LOG_LINE = (
+    "8787a3c41bf7ce0d54359d9348ad5b08e16bd5bb8ae5aa4e1508b435773a066e dandiarchive [01/Jan/2020:05:06:35 +0000] "
+    "192.0.2.0 - J42N2W7ET0EC03CV REST.GET.OBJECT blobs/11e/c89/11ec8933-1456-4942-922b-94e5878bb991 "
+    '"GET /blobs/11e/c89/11ec8933-1456-4942-922b-94e5878bb991 HTTP/1.1" 206 - 512 171408 53 52 "-" '
+    '"Mozilla/5.0 (X11; Linux x86_64)" - DX8oFoKQx0o5V3lwEuWBxF5p2fSXrwINj0rnxmas0YgjWuPqYLK/vnW60Txh23K93aahe0IFw2c= '
+    "- ECDHE-RSA-AES128-GCM-SHA256 - dandiarchive.s3.amazonaws.com TLSv1.2 -"
+)
+
+
+@pytest.mark.parametrize(
+    "raw_s3_log_line, is_declined",
+    [
+        pytest.param(BASE_RAW_S3_LOG_LINE, False, id="well_formed"),
+        pytest.param(BASE_RAW_S3_LOG_LINE.replace(" 206 ", "   206  "), False, id="repeated_spaces"),
+        pytest.param(BASE_RAW_S3_LOG_LINE.replace("HTTP/1.1", "?tag=[1] HTTP/1.1"), False, id="brackets_inside_quotes"),
+        pytest.param(BASE_RAW_S3_LOG_LINE.replace(' "-" ', ' "" '), True, id="empty_quotes"),
+        pytest.param(
+            BASE_RAW_S3_LOG_LINE.replace('"Mozilla/5.0 (X11; Linux x86_64)"', '""Mozilla/5.0 (X11; Linux x86_64)""'),
+            True,
+            id="doubled_quotes",
+        ),
+        pytest.param(
+            BASE_RAW_S3_LOG_LINE.replace("J42N2W7ET0EC03CV", 'J42N2W7E"T0EC03CV'), True, id="quote_inside_token"
+        ),
+        pytest.param(BASE_RAW_S3_LOG_LINE.replace("[01/Jan/2020:05:06:35 +0000]", "[]"), True, id="empty_brackets"),
+        pytest.param(
+            BASE_RAW_S3_LOG_LINE.replace("[01/Jan/2020:05:06:35 +0000]", "[01/Jan/2020:[05:06:35 +0000]"),
+            True,
+            id="nested_bracket",
+        ),
+        pytest.param(
+            BASE_RAW_S3_LOG_LINE.replace("[01/Jan/2020:05:06:35 +0000]", '[01/Jan/2020:05:06:35 "+0000] x"'),
+            True,
+            id="bracket_spanning_quote",
+        ),
+        pytest.param(BASE_RAW_S3_LOG_LINE.replace(' "-" ', ' "- '), True, id="odd_number_of_quotes"),
+    ],
+)
+def test_tokenize_s3_log_line(raw_s3_log_line: str, is_declined: bool) -> None:
+    """The tokenizer must either decline a line or agree exactly with the regex it shortcuts."""
+    tokenized_s3_log_line = dandi_s3_log_parser._s3_log_line_parser._tokenize_s3_log_line(
+        raw_s3_log_line=raw_s3_log_line
+    )
+
+    if is_declined:
+        assert tokenized_s3_log_line is None
+        return
+
+    expected_s3_log_line = [
+        a or b or c for a, b, c in dandi_s3_log_parser._globals._S3_LOG_REGEX.findall(string=raw_s3_log_line)
+    ]
+    assert tokenized_s3_log_line == expected_s3_log_line
+
+
+@pytest.mark.parametrize(
+    "timestamp, expected_iso_timestamp",
+    [
+        pytest.param("01/Jan/2020:05:06:35", "2020-01-01T05:06:35", id="start_of_year"),
+        pytest.param("31/Dec/2021:23:59:59", "2021-12-31T23:59:59", id="end_of_year"),
+        pytest.param("29/Feb/2024:00:00:00", "2024-02-29T00:00:00", id="leap_day"),
+    ],
+)
+def test_get_iso_timestamp(timestamp: str, expected_iso_timestamp: str) -> None:
+    iso_timestamp = dandi_s3_log_parser._s3_log_line_parser._get_iso_timestamp(timestamp=timestamp)
+
+    assert iso_timestamp == expected_iso_timestamp
+
+
+@pytest.mark.parametrize(
+    "timestamp",
+    [
+        pytest.param("01/Jan/2020:05:06:35 +0000", id="time_zone_not_stripped"),
+        pytest.param("1/Jan/2020:05:06:35", id="unpadded_day"),
+        pytest.param("01-Jan-2020:05:06:35", id="wrong_date_separators"),
+        pytest.param("01/Jan/2020T05:06:35", id="wrong_time_separator"),
+        pytest.param("01/Jan/2020:05:06+00", id="time_zone_in_place_of_seconds"),
+        pytest.param("01/Foo/2020:05:06:35", id="unknown_month"),
+        pytest.param("30/Feb/2020:05:06:35", id="day_out_of_range"),
+        pytest.param("01/Jan/2020:24:06:35", id="hour_out_of_range"),
+    ],
+)
+def test_get_iso_timestamp_rejects_malformed_timestamp(timestamp: str) -> None:
+    with pytest.raises(ValueError):
+        dandi_s3_log_parser._s3_log_line_parser._get_iso_timestamp(timestamp=timestamp)